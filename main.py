@@ -1,32 +1,103 @@
 import argparse
+import json
+import time
+import multiprocessing
+from multiprocessing.connection import wait
 from src.crew import scraping_crew, research_crew, email_crew
 
-def run_scraping_crew(query: str):
-    """Kicks off the lead scraping crew."""
-    print("## Starting the Lead Scraping Crew...")
+CREWS = {
+    'scrape': scraping_crew,
+    'research': research_crew,
+    'email': email_crew,
+}
+
+def _kickoff_task(crew_name: str, inputs: dict, conn):
+    """Runs a single crew kickoff inside a worker process and sends back how it went."""
+    try:
+        result = CREWS[crew_name].kickoff(inputs=inputs)
+        conn.send({"status": "ok", "result": str(result)})
+    except Exception as e:
+        conn.send({"status": "error", "error": str(e)})
+    finally:
+        conn.close()
+
+def _stop_process(process):
+    process.terminate()
+    process.join(5)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+def run_parallel(crew_name: str, task_inputs: list, workers: int, timeout: int):
+    """
+    Fans crew kickoffs out across up to `workers` processes, prints each kickoff's result and returns them all.
+    Each kickoff runs in its own process so the parent can kill it once it passes `timeout` seconds.
+    """
+    print(f"## Running {len(task_inputs)} {crew_name} crew kickoffs with {workers} workers...")
     print("-------------------------------------")
-    scraping_crew.kickoff(inputs={'query': query})
-    print("\n\n########################")
-    print("## Scraping Crew Work Complete!")
-    print("########################\n")
+    results = []
+    pending = list(task_inputs)
+    running = {}  # Maps a worker's result pipe to (process, inputs, start time)
 
-def run_research_crew():
-    """Kicks off the business research crew."""
-    print("## Starting the Business Research Crew...")
-    print("---------------------------------------")
-    research_crew.kickoff()
-    print("\n\n########################")
-    print("## Research Crew Work Complete!")
-    print("########################\n")
+    def record(inputs, outcome, started):
+        outcome.update({"inputs": inputs, "duration": time.time() - started})
+        results.append(outcome)
+        if outcome["status"] == "ok":
+            print(f"Finished {inputs} in {outcome['duration']:.1f}s")
+        else:
+            print(f"Failed {inputs}: {outcome['error']}")
+
+    while pending or running:
+        while pending and len(running) < workers:
+            inputs = pending.pop(0)
+            parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_kickoff_task, args=(crew_name, inputs, child_conn))
+            process.start()
+            child_conn.close()
+            running[parent_conn] = (process, inputs, time.time())
+
+        # Wake up when a worker reports back or exits, or when the nearest deadline passes
+        wait_for = 1.0
+        if timeout:
+            wait_for = max(0, min(started + timeout for _, _, started in running.values()) - time.time())
+        wait(list(running) + [process.sentinel for process, _, _ in running.values()], timeout=wait_for)
 
-def run_email_crew():
-    """Kicks off the email drafting crew."""
-    print("## Starting the Email Drafting Crew...")
-    print("------------------------------------")
-    email_crew.kickoff()
+        for conn, (process, inputs, started) in list(running.items()):
+            if conn.poll():
+                try:
+                    outcome = conn.recv()
+                except EOFError:
+                    outcome = {"status": "error", "error": "Worker exited without reporting a result."}
+                process.join()
+            elif not process.is_alive():
+                # The worker process itself died, so we only know that the task was lost
+                outcome = {"status": "error", "error": f"Worker exited with code {process.exitcode}."}
+            elif timeout and time.time() - started >= timeout:
+                _stop_process(process)
+                outcome = {"status": "error", "error": f"Timed out after {timeout}s."}
+            else:
+                continue
+            conn.close()
+            del running[conn]
+            record(inputs, outcome, started)
+
+    failed = [r for r in results if r["status"] != "ok"]
     print("\n\n########################")
-    print("## Email Drafting Crew Work Complete!")
+    print(f"## {crew_name.capitalize()} Crew Runs Complete: {len(results) - len(failed)} succeeded, {len(failed)} failed")
     print("########################\n")
+    for result in results:
+        print(f"### {result['inputs'] or crew_name} ({result['status']}, {result['duration']:.1f}s)")
+        print(result["result"] if result["status"] == "ok" else f"Error: {result['error']}")
+        print()
+    return results
+
+def build_task_inputs(queries: list, queries_file: str) -> list:
+    """Builds the scraping crew's kickoff inputs, one per query."""
+    all_queries = list(queries or [])
+    if queries_file:
+        with open(queries_file, 'r') as f:
+            all_queries.extend(line.strip() for line in f if line.strip())
+    return [{'query': query} for query in (all_queries or ["HVAC companies in Miami, FL"])]
 
 
 if __name__ == "__main__":
@@ -40,15 +111,47 @@ if __name__ == "__main__":
     parser.add_argument(
         "--query", 
         type=str, 
-        default="HVAC companies in Miami, FL", 
-        help="The search query for the scraping crew."
+        action="append",
+        help="A search query for the scraping crew. Repeat to run several queries."
+    )
+    parser.add_argument(
+        "--queries-file",
+        type=str,
+        help="A file with one search query per line for the scraping crew."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of crew kickoffs to run in parallel."
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=1800,
+        help="Maximum number of seconds for each crew kickoff (0 disables it)."
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="A JSON file to save every kickoff's inputs, status and result to."
     )
 
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1.")
+    if args.timeout < 0:
+        parser.error("--timeout cannot be negative.")
+    if args.crew != 'scrape' and (args.query or args.queries_file):
+        parser.error("--query and --queries-file only apply to the scrape crew.")
+
+    task_inputs = build_task_inputs(args.query, args.queries_file) if args.crew == 'scrape' else [{}]
+    results = run_parallel(args.crew, task_inputs, args.workers, args.timeout)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved {len(results)} results to {args.output}")
 
-    if args.crew == 'scrape':
-        run_scraping_crew(args.query)
-    elif args.crew == 'research':
-        run_research_crew()
-    elif args.crew == 'email':
-        run_email_crew() 
\ No newline at end of file
+    if any(r["status"] != "ok" for r in results):
+        raise SystemExit(1)
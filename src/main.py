@@ -5,7 +5,7 @@ from src.tools.google_maps_tool import GoogleMapsTool
 from src.tools.google_sheets_tool import GoogleSheetsTool
 from src.tools.search_tools import SearchTools
 from src.tools.email_tool import EmailTool
-import datetime
+from src.tools.email_spool import EmailSpool
 import os
 from openai import OpenAI
 
@@ -235,46 +235,131 @@ def synthesize_email():
         print("No reviewed leads to synthesize an email for.")
 
 
-def send_email_command():
-    """Sends a personalized email to a lead."""
+def send_email_command(workers=4):
+    """Queues every drafted email in the outbound spool and sends them with concurrent workers."""
     required_vars = ["SMTP_SERVER", "SMTP_PORT", "SMTP_USERNAME", "SMTP_PASSWORD", "SENDER_EMAIL"]
     if not all(os.getenv(var) for var in required_vars):
         print("Error: Missing one or more required environment variables for sending email.")
         return
 
-    print("Sending email...")
-    sheets_tool = GoogleSheetsTool()
-    email_tool = EmailTool()
+    spool = EmailSpool()
+    if not spool.lock():
+        print("Another send is already running on this spool. Try again once it finishes.")
+        return
 
-    lead_to_send = sheets_tool.get_next_task(status_to_find='Drafted')
+    try:
+        print("Sending emails...")
+        sheets_tool = GoogleSheetsTool()
+        email_tool = EmailTool()
+
+        # Anything still in flight from a crashed run may or may not have been delivered, so park it
+        held_count = spool.recover()
+        if held_count:
+            print(f"Found {held_count} emails interrupted mid-send. They will be marked 'Send Unconfirmed' for a manual check.")
+
+        sender_domain = os.getenv("SENDER_EMAIL").split("@")[-1]
+        missing_updates = {}
+        seen_keys = {}
+        queued_count = 0
+        for lead in sheets_tool.get_all_tasks(status_to_find='Drafted'):
+            key = EmailSpool.make_key(lead)
+            company_name = lead.get('Business Name', '')
+
+            # Rows with the same website, email and business name share a key, so only the first one is sent
+            if key in seen_keys:
+                print(f"Row {lead['row_index']} for {company_name} duplicates row {seen_keys[key]}. Marking it 'Duplicate Lead'.")
+                missing_updates[lead['row_index']] = {"Status": "Duplicate Lead"}
+                continue
+            seen_keys[key] = lead['row_index']
+
+            spool_state = spool.state_of(key)
+            if spool_state == "done":
+                print(f"Skipping row {lead['row_index']} for {company_name}: an email for this lead was already sent or is unconfirmed. "
+                      f"Use 'reset_unconfirmed' to send an unconfirmed one again.")
+                continue
+            if spool_state:
+                print(f"Skipping row {lead['row_index']} for {company_name}: its email is already in the spool ({spool_state}).")
+                continue
+
+            recipient_email = lead.get('Email')
+            email_draft = lead.get('Email Draft')
+
+            if recipient_email and recipient_email != 'Not Found' and email_draft:
+                # Simple subject line, can be improved
+                subject = f"A Free AI Transformation Audit for {company_name}"
+                message = email_tool.build_message(
+                    to=recipient_email,
+                    subject=subject,
+                    body=email_draft,
+                    message_id=f"<{key}@{sender_domain}>",
+                )
+                if spool.enqueue(key, company_name, recipient_email, message):
+                    queued_count += 1
+            else:
+                print(f"Cannot send email for {company_name}. Missing email address or draft.")
+                missing_updates[lead['row_index']] = {"Status": "Send Failed"}
+
+        if missing_updates:
+            update_result = sheets_tool.update_rows(missing_updates)
+            if not update_result or "Successfully" not in update_result:
+                print("Failed to update status for duplicate leads or leads missing an email or draft. Please check the sheet manually.")
+
+        print(f"Queued {queued_count} new emails. Dispatching with {workers} workers...")
+        results = spool.dispatch(email_tool, workers=workers)
+        print(f"Sent {results['sent']} emails, {results['failed']} failed, {results['held']} unconfirmed.")
+
+        confirm_delivery_states(sheets_tool, spool)
+    finally:
+        spool.unlock()
+
+
+DELIVERY_STATUSES = {
+    "sent": "Sent",
+    "failed": "Send Failed",
+    "held": "Send Unconfirmed",
+}
+
+
+def confirm_delivery_states(sheets_tool, spool):
+    """Writes the delivery state of spooled emails back to the sheet in one batch, including leftovers from earlier runs."""
+    confirmations = spool.pending_confirmations()
+    if not confirmations:
+        print("No email delivery states to confirm.")
+        return
 
-    if lead_to_send:
-        recipient_email = lead_to_send.get('Email')
-        company_name = lead_to_send.get('Business Name', '')
-        email_draft = lead_to_send.get('Email Draft')
-        
-        if recipient_email and recipient_email != 'Not Found' and email_draft:
-            # Simple subject line, can be improved
-            subject = f"A Free AI Transformation Audit for {company_name}"
-            
-            print(f"Sending email to {recipient_email} for {company_name}...")
-            result = email_tool.send_email(to=recipient_email, subject=subject, body=email_draft)
-            print(result)
-
-            update_data = {
-                "Status": "Sent",
-                "Email Sent Date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            update_result = sheets_tool.update_row(lead_to_send['row_index'], update_data)
-            if "Successfully" not in update_result:
-                print(f"Failed to update status for {company_name}. Please check the sheet manually.")
-        else:
-            print(f"Cannot send email for {company_name}. Missing email address or draft.")
-            update_result = sheets_tool.update_row(lead_to_send['row_index'], {"Status": "Send Failed"})
-            if "Successfully" not in update_result:
-                print(f"Failed to update status for {company_name} to 'Send Failed'. Please check the sheet manually.")
-    else:
-        print("No drafted emails to send.")
+    # Rows can shift between runs, so find each lead's current row by its key rather than trusting a stored index.
+    # Leads keep the 'Drafted' status until confirmed here, but a run that died right after writing the sheet
+    # leaves rows that already show their final status.
+    rows_by_key = {}
+    for lead in sheets_tool.get_all_tasks(status_to_find=['Drafted'] + list(DELIVERY_STATUSES.values())):
+        rows_by_key.setdefault(EmailSpool.make_key(lead), []).append(lead)
+
+    updates = {}
+    confirmed = []
+    for state, entry in confirmations:
+        status = DELIVERY_STATUSES[state]
+        rows = rows_by_key.get(entry['key'], [])
+        if any(row.get('Status') == status for row in rows):
+            confirmed.append((state, entry))
+            continue
+
+        drafted_rows = [row for row in rows if row.get('Status') == 'Drafted']
+        if not drafted_rows:
+            print(f"Warning: Could not find the drafted lead for {entry['company']} ({entry['to']}) in the sheet. Its email state '{state}' was not recorded.")
+            continue
+        updates[drafted_rows[0]['row_index']] = {"Status": status}
+        if state == "sent":
+            updates[drafted_rows[0]['row_index']]["Email Sent Date"] = entry['sent_date']
+        confirmed.append((state, entry))
+
+    if updates:
+        update_result = sheets_tool.update_rows(updates)
+        if not update_result or "Successfully" not in update_result:
+            print("Failed to confirm delivery state in the sheet. It will be retried on the next run.")
+            return
+
+    spool.confirm(confirmed)
+    print(f"Confirmed delivery state for {len(confirmed)} emails in the sheet.")
 
 
 def reset_failed_command():
@@ -292,6 +377,31 @@ def reset_failed_command():
         print("No leads with 'Send Failed' status found.")
 
 
+def reset_unconfirmed_command():
+    """Re-arms a lead whose email was marked 'Send Unconfirmed', after checking it was not delivered."""
+    print("Resetting unconfirmed email status...")
+    spool = EmailSpool()
+    if not spool.lock():
+        print("A send is currently running on this spool. Try again once it finishes.")
+        return
+
+    try:
+        sheets_tool = GoogleSheetsTool()
+        lead_to_reset = sheets_tool.get_next_task(status_to_find='Send Unconfirmed')
+
+        if lead_to_reset:
+            company_name = lead_to_reset.get('Business Name', '')
+            if not spool.release(EmailSpool.make_key(lead_to_reset)):
+                print(f"Could not release the spooled email for {company_name}. Please check the spool manually.")
+                return
+            print(f"Resetting status for {company_name} from 'Send Unconfirmed' to 'Drafted'.")
+            sheets_tool.update_row(lead_to_reset['row_index'], {"Status": "Drafted"})
+        else:
+            print("No leads with 'Send Unconfirmed' status found.")
+    finally:
+        spool.unlock()
+
+
 def run_follow_up_campaigns():
     """Runs follow-up email campaigns for leads that have been contacted."""
     print("Running follow-up campaigns...")
@@ -327,11 +437,15 @@ def main():
     subparsers.add_parser("synthesize", help="Synthesize a personalized email")
     
     # Send command
-    subparsers.add_parser("send", help="Send a personalized email")
+    send_parser = subparsers.add_parser("send", help="Send all drafted emails through the outbound spool")
+    send_parser.add_argument("--workers", type=int, default=4, help="Number of concurrent sending workers")
     
     # Reset Failed command
     subparsers.add_parser("reset_failed", help="Reset a lead's status from 'Send Failed' to 'Drafted'")
 
+    # Reset Unconfirmed command
+    subparsers.add_parser("reset_unconfirmed", help="Reset a lead's status from 'Send Unconfirmed' to 'Drafted' once you've checked it wasn't delivered")
+
     # Follow-up command
     subparsers.add_parser("followup", help="Run follow-up campaigns")
 
@@ -346,9 +460,11 @@ def main():
     elif args.command == "synthesize":
         synthesize_email()
     elif args.command == "send":
-        send_email_command()
+        send_email_command(args.workers)
     elif args.command == "reset_failed":
         reset_failed_command()
+    elif args.command == "reset_unconfirmed":
+        reset_unconfirmed_command()
     elif args.command == "followup":
         run_follow_up_campaigns()
 
@@ -0,0 +1,225 @@
+import os
+import json
+import fcntl
+import queue
+import hashlib
+import datetime
+from email import message_from_string
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from src.tools.email_tool import REJECTED_ERRORS
+
+load_dotenv()
+
+class EmailSpool:
+    """
+    A durable, maildir-style outbound queue. Each message lives in exactly one state directory
+    and moves between them with atomic renames:
+
+        tmp/    -> being written, never dispatched
+        new/    -> rendered and waiting to be sent
+        cur/    -> claimed by a worker and being sent
+        sent/   -> accepted by the SMTP server, sheet not yet updated
+        failed/ -> refused by the SMTP server before it accepted the message, sheet not yet updated
+        held/   -> may or may not have been delivered, sheet not yet updated
+        done/   -> sent or held, and confirmed in the sheet
+
+    Messages stay in done/ so their idempotency key keeps a lead from being queued again.
+    Only one process may use a spool at a time, see lock().
+    """
+    STATES = ["tmp", "new", "cur", "sent", "failed", "held", "done"]
+
+    def __init__(self, spool_dir=None):
+        self.spool_dir = spool_dir or os.getenv("EMAIL_SPOOL_DIR", ".spool/outbound")
+        self.lock_file = None
+        for state in self.STATES:
+            os.makedirs(os.path.join(self.spool_dir, state), exist_ok=True)
+
+    def lock(self) -> bool:
+        """Takes an exclusive lock on the spool. Returns False if another process already holds it."""
+        self.lock_file = open(os.path.join(self.spool_dir, ".lock"), 'w')
+        try:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            self.lock_file.close()
+            self.lock_file = None
+            return False
+
+    def unlock(self):
+        """Releases the lock taken by lock()."""
+        if self.lock_file:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+            self.lock_file.close()
+            self.lock_file = None
+
+    @staticmethod
+    def make_key(lead: dict) -> str:
+        """Builds a stable idempotency key for a lead from its website, email and business name."""
+        identity = "|".join(
+            str(lead.get(field, "")).strip().lower() for field in ("Website", "Email", "Business Name")
+        )
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def _path(self, state: str, key: str) -> str:
+        return os.path.join(self.spool_dir, state, f"{key}.json")
+
+    def _read(self, state: str, key: str) -> dict:
+        with open(self._path(state, key), 'r') as f:
+            return json.load(f)
+
+    def _write(self, state: str, entry: dict):
+        """Writes an entry into a state directory via tmp/ so readers never see a partial file."""
+        tmp_path = self._path("tmp", entry["key"])
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(state, entry["key"]))
+
+    def _keys(self, state: str) -> list:
+        directory = os.path.join(self.spool_dir, state)
+        return sorted(name[:-len(".json")] for name in os.listdir(directory) if name.endswith(".json"))
+
+    def state_of(self, key: str):
+        """Returns the state directory holding this idempotency key, or None if it isn't spooled."""
+        for state in self.STATES:
+            if state != "tmp" and os.path.exists(self._path(state, key)):
+                return state
+        return None
+
+    def has(self, key: str) -> bool:
+        """Checks whether a message with this idempotency key is anywhere in the spool."""
+        return self.state_of(key) is not None
+
+    def enqueue(self, key: str, company: str, to: str, message) -> bool:
+        """Adds a rendered message to the queue. Returns False if the key is already spooled."""
+        if self.has(key):
+            return False
+        self._write("new", {
+            "key": key,
+            "company": company,
+            "to": to,
+            "message": message.as_string(),
+        })
+        return True
+
+    def recover(self) -> int:
+        """
+        Moves messages left in cur/ by a crashed run into held/ and returns how many there were.
+        We cannot tell whether the SMTP server accepted them, so they are never retried automatically.
+        """
+        held_count = 0
+        for key in self._keys("cur"):
+            # A crash right after _finish() wrote the outcome leaves a stale copy behind in cur/
+            if any(os.path.exists(self._path(state, key)) for state in ("sent", "failed", "held", "done")):
+                os.remove(self._path("cur", key))
+                continue
+            os.replace(self._path("cur", key), self._path("held", key))
+            held_count += 1
+        return held_count
+
+    def release(self, key: str) -> bool:
+        """
+        Removes a confirmed held message from done/ so its lead can be queued again after a manual check.
+        Messages that were actually sent are never released. Returns whether the key was released.
+        """
+        try:
+            entry = self._read("done", key)
+        except FileNotFoundError:
+            return False
+        if entry.get("sent_date"):
+            return False
+        os.remove(self._path("done", key))
+        return True
+
+    def _finish(self, state: str, entry: dict):
+        self._write(state, entry)
+        os.remove(self._path("cur", entry["key"]))
+
+    def _worker(self, email_tool, keys: queue.Queue, results: dict):
+        """Sends messages from the shared queue over a single SMTP connection, reconnecting only when it drops."""
+        server = None
+        try:
+            while True:
+                try:
+                    key = keys.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    # Claiming is an atomic rename, so a message can only ever be picked up by one worker
+                    os.rename(self._path("new", key), self._path("cur", key))
+                except OSError:
+                    continue
+                entry = self._read("cur", key)
+
+                try:
+                    if server and not email_tool.is_alive(server):
+                        email_tool.disconnect(server)
+                        server = None
+                    if not server:
+                        server = email_tool.connect()
+                except Exception as e:
+                    # Nothing was sent yet, so this is a plain failure
+                    entry["error"] = str(e)
+                    self._finish("failed", entry)
+                    results["failed"] += 1
+                    print(f"Failed to connect to send email to {entry['to']} for {entry['company']}: {e}")
+                    continue
+
+                try:
+                    email_tool.send_message(message_from_string(entry["message"]), server=server)
+                except REJECTED_ERRORS as e:
+                    entry["error"] = str(e)
+                    self._finish("failed", entry)
+                    results["failed"] += 1
+                    print(f"Failed to send email to {entry['to']} for {entry['company']}: {e}")
+                    continue
+                except Exception as e:
+                    # The server may already have accepted the message, so it must never be retried
+                    entry["error"] = str(e)
+                    self._finish("held", entry)
+                    results["held"] += 1
+                    email_tool.disconnect(server)
+                    server = None
+                    print(f"Could not confirm email to {entry['to']} for {entry['company']} was delivered: {e}")
+                    continue
+
+                entry["sent_date"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self._finish("sent", entry)
+                results["sent"] += 1
+                print(f"Email sent successfully to {entry['to']} for {entry['company']}")
+        finally:
+            if server:
+                email_tool.disconnect(server)
+
+    def dispatch(self, email_tool, workers: int = 4) -> dict:
+        """Drains new/ with a pool of concurrent workers and returns how many were sent, failed and held."""
+        keys = queue.Queue()
+        for key in self._keys("new"):
+            keys.put(key)
+
+        workers = max(1, min(workers, keys.qsize()))
+        worker_results = [{"sent": 0, "failed": 0, "held": 0} for _ in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._worker, email_tool, keys, results) for results in worker_results]
+            for future in futures:
+                future.result()
+
+        return {outcome: sum(results[outcome] for results in worker_results) for outcome in ("sent", "failed", "held")}
+
+    def pending_confirmations(self) -> list:
+        """Returns (state, entry) pairs for every message whose delivery state is not yet in the sheet."""
+        return [(state, self._read(state, key)) for state in ("sent", "failed", "held") for key in self._keys(state)]
+
+    def confirm(self, confirmations: list):
+        """
+        Finalizes messages once their state has been written to the sheet. Sent and held messages move
+        to done/, failed ones are dropped so the lead can be queued again after its status is reset.
+        """
+        for state, entry in confirmations:
+            if state in ("sent", "held"):
+                os.replace(self._path(state, entry["key"]), self._path("done", entry["key"]))
+            else:
+                os.remove(self._path(state, entry["key"]))
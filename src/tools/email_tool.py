@@ -6,6 +6,16 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Errors that mean the server refused the message before accepting it, so it was definitely not delivered.
+# Anything else raised while sending (timeouts, dropped connections) may come after the server queued it.
+REJECTED_ERRORS = (
+    smtplib.SMTPHeloError,
+    smtplib.SMTPNotSupportedError,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPDataError,
+)
+
 class EmailTool:
     def __init__(self):
         self.smtp_server = os.getenv("SMTP_SERVER")
@@ -17,22 +27,75 @@ class EmailTool:
         if not all([self.smtp_server, self.smtp_port, self.smtp_username, self.smtp_password, self.sender_email]):
             raise ValueError("One or more SMTP environment variables are not set.")
 
-    def send_email(self, to: str, subject: str, body: str):
+    def build_message(self, to: str, subject: str, body: str, message_id: str = None) -> MIMEMultipart:
         """
-        Sends an email using smtplib.
+        Renders the MIME message for an email without sending it.
         """
         msg = MIMEMultipart()
         msg['From'] = self.sender_email
         msg['To'] = to
         msg['Subject'] = subject
+        if message_id:
+            msg['Message-ID'] = message_id
 
         msg.attach(MIMEText(body, 'plain'))
+        return msg
+
+    def connect(self) -> smtplib.SMTP:
+        """
+        Opens an authenticated SMTP connection that can be reused for several messages.
+        """
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls()
+            server.login(self.smtp_username, self.smtp_password)
+        except Exception:
+            self.disconnect(server)
+            raise
+        return server
+
+    def disconnect(self, server: smtplib.SMTP):
+        """
+        Closes an SMTP connection. A bad QUIT reply is ignored, since any message sent on the
+        connection has already been accepted by then.
+        """
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def is_alive(self, server: smtplib.SMTP) -> bool:
+        """
+        Checks whether a reused connection is still open before sending on it.
+        """
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def send_message(self, msg, server: smtplib.SMTP = None):
+        """
+        Sends an already rendered message using smtplib. Raises on failure.
+        Uses the given connection if there is one, otherwise opens its own.
+        """
+        if server:
+            server.send_message(msg)
+            return
+
+        server = self.connect()
+        try:
+            server.send_message(msg)
+        finally:
+            self.disconnect(server)
+
+    def send_email(self, to: str, subject: str, body: str):
+        """
+        Sends an email using smtplib.
+        """
+        msg = self.build_message(to, subject, body)
 
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
+            self.send_message(msg)
             return f"Email sent successfully to {to}"
         except Exception as e:
-            return f"An error occurred while sending the email: {e}" 
\ No newline at end of file
+            return f"An error occurred while sending the email: {e}"
\ No newline at end of file
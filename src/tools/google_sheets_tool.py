@@ -24,15 +24,42 @@ class GoogleSheetsTool:
 
     def get_next_task(self, status_to_find: str):
         """Finds the next row with a given status and returns it as a dictionary."""
+        tasks = self.get_all_tasks(status_to_find)
+        return tasks[0] if tasks else None
+
+    def get_all_tasks(self, status_to_find) -> list:
+        """Finds every row with a given status, or any of a list of statuses, and returns them as a list of dictionaries."""
+        statuses = {status_to_find} if isinstance(status_to_find, str) else set(status_to_find)
         try:
             records = self.worksheet.get_all_records()
+            tasks = []
             for i, row in enumerate(records):
-                if row.get("Status") == status_to_find:
+                if row.get("Status") in statuses:
                     row['row_index'] = i + 2  # +2 to account for header and 0-indexing
-                    return row
-            return None
+                    tasks.append(row)
+            return tasks
+        except Exception as e:
+            print(f"An error occurred while getting tasks: {e}")
+            return []
+
+    def update_rows(self, updates: dict):
+        """Updates many rows in a single batch. Maps each row index to its update data."""
+        try:
+            header = self.worksheet.row_values(1)
+            cell_list = []
+            for row_index, update_data in updates.items():
+                for col_name, new_value in update_data.items():
+                    if col_name in header:
+                        col_index = header.index(col_name) + 1
+                        cell_list.append(gspread.Cell(row_index, col_index, value=new_value))
+                    else:
+                        print(f"Warning: Column '{col_name}' not found in sheet.")
+
+            if cell_list:
+                self.worksheet.update_cells(cell_list)
+            return f"Successfully updated {len(updates)} rows."
         except Exception as e:
-            print(f"An error occurred while getting the next task: {e}")
+            print(f"An error occurred while updating rows: {e}")
             return None
 
     def update_row(self, row_index: int, update_data: dict):
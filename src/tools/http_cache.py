@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class HttpCache:
+    def __init__(self, cache_dir=None, ttl=None, negative_ttl=None, dead_after=None, failure_interval=None):
+        self.cache_dir = cache_dir or os.getenv("SCRAPE_CACHE_DIR", ".cache/websites")
+        # How long a cached extraction is trusted before we revalidate it with a conditional GET
+        self.ttl = int(ttl if ttl is not None else os.getenv("SCRAPE_CACHE_TTL", 7 * 24 * 3600))
+        # How long a dead or timed-out domain is skipped before we try it again
+        self.negative_ttl = int(negative_ttl if negative_ttl is not None else os.getenv("SCRAPE_CACHE_NEGATIVE_TTL", 24 * 3600))
+        # How many failures it takes to call a domain dead, and how far apart they must be to count separately,
+        # so a short network or DNS outage on our side doesn't blacklist every domain we touched during it
+        self.dead_after = int(dead_after if dead_after is not None else os.getenv("SCRAPE_CACHE_DEAD_AFTER", 3))
+        self.failure_interval = int(failure_interval if failure_interval is not None else os.getenv("SCRAPE_CACHE_FAILURE_INTERVAL", 3600))
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path_for(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _read(self, key: str):
+        try:
+            with open(self._path_for(key), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, entry: dict):
+        """Writes an entry atomically so a crash never leaves a half-written cache file."""
+        try:
+            with tempfile.NamedTemporaryFile('w', dir=self.cache_dir, suffix=".tmp", delete=False) as f:
+                json.dump(entry, f)
+            os.replace(f.name, self._path_for(key))
+        except OSError as e:
+            print(f"An error occurred while writing the website cache: {e}")
+
+    @staticmethod
+    def _domain_key(url: str) -> str:
+        return "domain:" + urlparse(url).netloc.lower()
+
+    def get(self, url: str):
+        """Returns the cached entry for a URL, or None if it has never been fetched."""
+        return self._read(url)
+
+    def is_fresh(self, entry: dict) -> bool:
+        """Checks whether a cached entry can be used without revalidating it."""
+        return bool(entry) and time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def validators(self, entry: dict) -> dict:
+        """Builds the conditional request headers for revalidating a cached entry."""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, contact_info: dict, etag=None, last_modified=None):
+        """Saves the extracted contacts for a URL along with its validators."""
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "contact_info": contact_info,
+            "fetched_at": time.time(),
+        }
+        self._write(url, entry)
+        return entry
+
+    def touch(self, url: str, entry: dict):
+        """Marks a cached entry as freshly revalidated after a 304 Not Modified."""
+        entry["fetched_at"] = time.time()
+        self._write(url, entry)
+
+    def get_dead_domain(self, url: str):
+        """Returns the recorded failure if the URL's domain is known to be dead, otherwise None."""
+        entry = self._read(self._domain_key(url))
+        if (
+            entry
+            and entry.get("failures", 0) >= self.dead_after
+            and time.time() - entry.get("failed_at", 0) < self.negative_ttl
+        ):
+            return entry.get("error")
+        return None
+
+    def record_domain_failure(self, url: str, error: str):
+        """
+        Records that a domain timed out or could not be reached. Failures closer together than
+        failure_interval count once, and the count restarts once negative_ttl has passed.
+        """
+        now = time.time()
+        entry = self._read(self._domain_key(url))
+        if not entry or now - entry.get("failed_at", 0) >= self.negative_ttl:
+            entry = {"failures": 1, "failed_at": now}
+        elif now - entry.get("failed_at", 0) >= self.failure_interval:
+            entry = {"failures": entry.get("failures", 0) + 1, "failed_at": now}
+        entry["error"] = error
+        self._write(self._domain_key(url), entry)
+
+    def clear_domain_failures(self, url: str):
+        """Forgets earlier failures once a domain answers again."""
+        try:
+            os.remove(self._path_for(self._domain_key(url)))
+        except FileNotFoundError:
+            pass
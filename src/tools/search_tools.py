@@ -1,16 +1,24 @@
 import os
 import re
+import socket
 import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from perplexipy import PerplexityClient
+from src.tools.http_cache import HttpCache
 
 # Load environment variables from .env file
 load_dotenv()
 
+# getaddrinfo errors that mean the name really doesn't exist, as opposed to a temporary resolver failure (EAI_AGAIN)
+DEAD_NAME_ERRNOS = {
+    errno for errno in (getattr(socket, "EAI_NONAME", None), getattr(socket, "EAI_NODATA", None)) if errno is not None
+}
+
 class SearchTools:
     def __init__(self):
         self.perplexity_client = PerplexityClient(os.getenv("PERPLEXITY_API_KEY"))
+        self.website_cache = HttpCache()
 
     def search_internet(self, query: str) -> str:
         """
@@ -25,12 +33,61 @@ class SearchTools:
         except Exception as e:
             return f"An error occurred during the search: {e}"
 
+    @staticmethod
+    def _is_dead_domain_error(error: Exception) -> bool:
+        """
+        Checks whether a request failed because the domain itself is unreachable: a connect or read
+        timeout, a name that doesn't exist, or a refused connection. TLS, proxy and one-off reset
+        errors don't count, and neither do temporary DNS failures, since they say little about
+        whether the site is still alive.
+        """
+        if isinstance(error, (requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout)):
+            return True
+        if isinstance(error, (requests.exceptions.SSLError, requests.exceptions.ProxyError)):
+            return False
+        if not isinstance(error, requests.exceptions.ConnectionError):
+            return False
+
+        # requests wraps the socket error several layers deep (MaxRetryError -> NewConnectionError -> OSError)
+        pending, seen = [error], set()
+        while pending:
+            current = pending.pop()
+            if id(current) in seen:
+                continue
+            seen.add(id(current))
+            if isinstance(current, socket.gaierror):
+                return current.errno in DEAD_NAME_ERRNOS
+            if isinstance(current, ConnectionRefusedError):
+                return True
+            pending.extend(
+                candidate for candidate in (getattr(current, "reason", None), current.__cause__, current.__context__, *current.args)
+                if isinstance(candidate, BaseException)
+            )
+        return False
+
     def scrape_website_for_contact_info(self, url: str) -> dict:
         """
         Scrapes a website to find contact information like email and social media links.
+        Results are cached on disk and revalidated with conditional GETs, and domains that
+        time out or refuse the connection are skipped until their negative cache entry expires.
         """
+        cached = self.website_cache.get(url)
+        if cached and self.website_cache.is_fresh(cached):
+            return cached["contact_info"]
+
+        dead_domain_error = self.website_cache.get_dead_domain(url)
+        if dead_domain_error:
+            # Stale contacts still beat none at all
+            if cached:
+                return cached["contact_info"]
+            return {"error": f"Skipping known dead domain: {dead_domain_error}"}
+
         try:
-            response = requests.get(url, timeout=10)
+            response = requests.get(url, timeout=10, headers=self.website_cache.validators(cached))
+            self.website_cache.clear_domain_failures(url)
+            if response.status_code == 304 and cached:
+                self.website_cache.touch(url, cached)
+                return cached["contact_info"]
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
 
@@ -43,10 +100,22 @@ class SearchTools:
                 "emails": list(set(emails)),
                 "url": url
             }
-            
+
+            self.website_cache.store(
+                url,
+                contact_info,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
             return contact_info
 
         except requests.exceptions.RequestException as e:
+            if self._is_dead_domain_error(e):
+                self.website_cache.record_domain_failure(url, str(e))
+            if cached:
+                return cached["contact_info"]
             return {"error": f"Could not retrieve the webpage: {e}"}
         except Exception as e:
-            return {"error": f"An error occurred during scraping: {e}"} 
\ No newline at end of file
+            if cached:
+                return cached["contact_info"]
+            return {"error": f"An error occurred during scraping: {e}"}
\ No newline at end of file